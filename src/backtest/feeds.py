@@ -0,0 +1,52 @@
+import numpy as np
+import backtrader as bt
+
+
+class FastPandasData(bt.feed.DataBase):
+    """
+    Drop-in replacement for bt.feeds.PandasData specialized to the
+    frames download_data produces (DatetimeIndex + OHLCV columns).
+
+    The frame is sliced once at start() into per-column NumPy buffers
+    and _load() just advances an index pointer, instead of Backtrader's
+    generic per-row, per-column cell mapping.
+    """
+
+    def start(self):
+        super().start()
+        df = self.p.dataname
+
+        arr = df[["Open", "High", "Low", "Close", "Volume"]].to_numpy(
+            dtype=np.float64
+        )
+        self._open = arr[:, 0]
+        self._high = arr[:, 1]
+        self._low = arr[:, 2]
+        self._close = arr[:, 3]
+        self._volume = arr[:, 4]
+
+        idx = df.index
+        if getattr(idx, "tz", None) is not None:
+            idx = idx.tz_localize(None)
+        dt_ns = idx.values.astype("datetime64[ns]").astype(np.int64)
+        # Backtrader datetimes are matplotlib-style day floats
+        # (days since 0001-01-01, plus 1); 719163.0 is 1970-01-01
+        self._dt = dt_ns / 86400e9 + 719163.0
+
+        self._idx = 0
+        self._len = len(df)
+
+    def _load(self):
+        i = self._idx
+        if i >= self._len:
+            return False
+        self._idx = i + 1
+
+        self.lines.datetime[0] = self._dt[i]
+        self.lines.open[0] = self._open[i]
+        self.lines.high[0] = self._high[i]
+        self.lines.low[0] = self._low[i]
+        self.lines.close[0] = self._close[i]
+        self.lines.volume[0] = self._volume[i]
+        self.lines.openinterest[0] = 0.0
+        return True
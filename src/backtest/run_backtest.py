@@ -1,16 +1,52 @@
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import lru_cache
+
 import pandas as pd
 import yfinance as yf
 import backtrader as bt
 from loguru import logger
 
-from src.strategies.crossover import MacdRsiEmaStrategy
+from src.backtest.feeds import FastPandasData
+from src.strategies.crossover import QuickScalpMACD
 
+CACHE_DIR = ".cache"
 
-def download_data(ticker: str, period: str = "7d") -> pd.DataFrame:
+
+def _cache_path(ticker: str, period: str, interval: str) -> str:
+    return os.path.join(CACHE_DIR, f"{ticker}_{period}_{interval}.parquet")
+
+
+def _cache_is_fresh(path: str) -> bool:
     """
-    Download ~1 week of 2-minute data for the given ticker.
+    Treat the cache as fresh if it was written after the most recent
+    session open (09:30 local), so intraday re-runs skip the network
+    but a new trading day forces a re-download.
     """
+    if not os.path.exists(path):
+        return False
+    mtime = datetime.fromtimestamp(os.path.getmtime(path))
+    now = datetime.now()
+    session_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
+    if now < session_open:
+        # before today's open the reference is yesterday's open,
+        # otherwise pre-market runs would always bypass the cache
+        session_open -= timedelta(days=1)
+    return mtime >= session_open
+
+
+@lru_cache(maxsize=32)
+def _download_data_cached(ticker: str, period: str) -> pd.DataFrame:
+    wanted = ["Open", "High", "Low", "Close", "Volume"]
+
+    path = _cache_path(ticker, period, "2m")
+    if _cache_is_fresh(path):
+        logger.info(f"Loading {ticker} from cache: {path}")
+        # columnar readback: only the wanted columns are materialized
+        return pd.read_parquet(path, columns=wanted, engine="pyarrow")
+
     logger.info(f"Downloading {ticker} | period={period}, interval=2m")
     df = yf.download(
         ticker,
@@ -27,19 +63,43 @@ def download_data(ticker: str, period: str = "7d") -> pd.DataFrame:
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.get_level_values(0)
 
-    # Keep only the columns Backtrader cares about
-    wanted = ["Open", "High", "Low", "Close", "Volume"]
-    df = df[wanted]
+    # Keep only the columns Backtrader cares about; reindex avoids the
+    # full-frame copy that df[wanted] would make
+    df = df.reindex(columns=wanted, copy=False)
+
+    # float32 is ample precision for prices and halves the memory
+    # bandwidth of every downstream indicator pass
+    df[["Open", "High", "Low", "Close"]] = df[
+        ["Open", "High", "Low", "Close"]
+    ].astype("float32")
+    # intraday frames can carry NaN volume (halts / in-progress bars)
+    df["Volume"] = df["Volume"].fillna(0).astype("int32")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df.to_parquet(path, engine="pyarrow", compression="zstd")
 
     return df
 
 
+def download_data(ticker: str, period: str = "7d") -> pd.DataFrame:
+    """
+    Download ~1 week of 2-minute data for the given ticker.
+
+    Results are cached to Parquet under .cache/ so repeat runs load
+    straight from disk instead of yfinance, and memoized in-process
+    with lru_cache so repeated calls from the same driver skip even
+    the disk read. Callers get a shallow copy so the cached frame
+    cannot be mutated.
+    """
+    return _download_data_cached(ticker, period).copy(deep=False)
+
+
 def main(ticker: str, cash: float, period: str):
     # 1) get history
     df = download_data(ticker, period)
 
     # 2) wrap for Backtrader as 2-minute bars
-    data_feed = bt.feeds.PandasData(
+    data_feed = FastPandasData(
         dataname=df,
         timeframe=bt.TimeFrame.Minutes,
         compression=2,
@@ -52,7 +112,7 @@ def main(ticker: str, cash: float, period: str):
     cerebro.broker.setcommission(commission=0.0005)  # 5 bps
 
     # 4) add MACD+RSI+EMA strategy
-    cerebro.addstrategy(MacdRsiEmaStrategy, stake=10)
+    cerebro.addstrategy(QuickScalpMACD)
 
     # 5) run
     start_val = cerebro.broker.getvalue()
@@ -64,15 +124,87 @@ def main(ticker: str, cash: float, period: str):
     logger.info(f"Final   Portfolio Value: {end_val:,.2f}")
 
 
+def run_optimize(ticker: str, cash: float, period: str, max_workers=None):
+    """
+    Sweep a QuickScalpMACD parameter grid inside a single cerebro via
+    optstrategy: Backtrader forks one task per combination (up to
+    maxcpus) and the data feed is loaded once for the whole grid
+    instead of once per config.
+    """
+    df = download_data(ticker, period)
+    data_feed = FastPandasData(
+        dataname=df,
+        timeframe=bt.TimeFrame.Minutes,
+        compression=2,
+    )
+
+    cerebro = bt.Cerebro(optreturn=True)
+    cerebro.adddata(data_feed)
+    cerebro.broker.setcash(cash)
+    cerebro.broker.setcommission(commission=0.0005)  # 5 bps
+    cerebro.optstrategy(
+        QuickScalpMACD,
+        ema_tolerance=[0.0025, 0.005, 0.01],
+        rsi_oversold=[25, 30, 35, 40],
+        tp_pct=[0.001, 0.002, 0.003],
+        sl_pct=[0.0005, 0.001],
+    )
+
+    results = cerebro.run(maxcpus=max_workers)
+    logger.info(f"{ticker}: optimized {len(results)} combinations")
+    return results
+
+
+def run_parallel(tickers, cash: float, period: str, max_workers=None):
+    """
+    Run one backtest per ticker across a process pool.
+
+    Backtrader's event loop is single-threaded and GIL-bound, so a
+    multi-instrument sweep scales ~linearly with cores when each
+    (download_data + cerebro.run) goes to its own process.
+    max_tasks_per_child=1 recycles workers so Backtrader's buffers are
+    released between tasks.
+    """
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {
+            pool.submit(main, ticker, cash, period): ticker
+            for ticker in tickers
+        }
+        for fut in as_completed(futures):
+            ticker = futures[fut]
+            try:
+                fut.result()
+                logger.info(f"Done: {ticker}")
+            except Exception as exc:
+                logger.error(f"Failed: {ticker} | {exc}")
+
+
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
-    ap.add_argument("--ticker", default="SPY")
+    ap.add_argument("--ticker", default="SPY")  # comma-separated for a sweep
     ap.add_argument("--cash", type=float, default=25_000)
     ap.add_argument("--period", default="7d")  # about a week
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--optimize", action="store_true")
     args = ap.parse_args()
 
-    main(
-        ticker=args.ticker,
-        cash=args.cash,
-        period=args.period,
-    )
+    tickers = args.ticker.split(",")
+    if args.optimize:
+        for t in tickers:
+            run_optimize(t, args.cash, args.period, max_workers=args.workers)
+    elif len(tickers) == 1:
+        main(
+            ticker=tickers[0],
+            cash=args.cash,
+            period=args.period,
+        )
+    else:
+        run_parallel(
+            tickers=tickers,
+            cash=args.cash,
+            period=args.period,
+            max_workers=args.workers,
+        )
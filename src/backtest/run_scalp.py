@@ -1,23 +1,73 @@
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
 import pandas as pd
 import yfinance as yf
 import backtrader as bt
 from loguru import logger
+from ta.momentum import RSIIndicator
+from ta.trend import MACD
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the Python loop
+    njit = None
 
+from src.backtest.feeds import FastPandasData
 from src.strategies.crossover import QuickScalpMACD
 
+CACHE_DIR = ".cache"
 
-def download_data(ticker: str, period: str = "30d") -> pd.DataFrame:
+
+def _cache_path(ticker: str, period: str, interval: str) -> str:
+    return os.path.join(CACHE_DIR, f"{ticker}_{period}_{interval}.parquet")
+
+
+def _cache_is_fresh(path: str) -> bool:
     """
-    Download intraday data for scalping.
-    Default: ~30 days, 2-minute bars.
+    Treat the cache as fresh if it was written after the most recent
+    session open (09:30 local), so intraday re-runs skip the network
+    but a new trading day forces a re-download.
     """
+    if not os.path.exists(path):
+        return False
+    mtime = datetime.fromtimestamp(os.path.getmtime(path))
+    now = datetime.now()
+    session_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
+    if now < session_open:
+        # before today's open the reference is yesterday's open,
+        # otherwise pre-market runs would always bypass the cache
+        session_open -= timedelta(days=1)
+    return mtime >= session_open
+
+
+@lru_cache(maxsize=32)
+def _download_data_cached(ticker: str, period: str) -> pd.DataFrame:
+    wanted = ["Open", "High", "Low", "Close", "Volume"]
+
+    # "2m-raw" keeps these unadjusted bars apart from any cache files
+    # written while auto_adjust was on
+    path = _cache_path(ticker, period, "2m-raw")
+    if _cache_is_fresh(path):
+        logger.info(f"Loading {ticker} from cache: {path}")
+        # columnar readback: only the wanted columns are materialized
+        return pd.read_parquet(path, columns=wanted, engine="pyarrow")
+
     logger.info(f"Downloading {ticker} | period={period}, interval=2m")
+    # raw bars: split/dividend adjustment is a no-op on a 30d intraday
+    # window, so skip yfinance's adjustment pass (and its progress bar)
     df = yf.download(
         ticker,
         period=period,
         interval="2m",
-        auto_adjust=True,
+        auto_adjust=False,
+        progress=False,
+        threads=True,
     )
 
     if df.empty:
@@ -27,18 +77,43 @@ def download_data(ticker: str, period: str = "30d") -> pd.DataFrame:
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.get_level_values(0)
 
-    wanted = ["Open", "High", "Low", "Close", "Volume"]
-    df = df[wanted]
+    # reindex avoids the full-frame copy that df[wanted] would make
+    df = df.reindex(columns=wanted, copy=False)
+
+    # float32 is ample precision for prices and halves the memory
+    # bandwidth of every downstream indicator pass
+    df[["Open", "High", "Low", "Close"]] = df[
+        ["Open", "High", "Low", "Close"]
+    ].astype("float32")
+    # intraday frames can carry NaN volume (halts / in-progress bars)
+    df["Volume"] = df["Volume"].fillna(0).astype("int32")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df.to_parquet(path, engine="pyarrow", compression="zstd")
 
     return df
 
 
+def download_data(ticker: str, period: str = "30d") -> pd.DataFrame:
+    """
+    Download intraday data for scalping.
+    Default: ~30 days, 2-minute bars.
+
+    Results are cached to Parquet under .cache/ so repeat runs (e.g.
+    parameter sweeps) load straight from disk instead of yfinance, and
+    memoized in-process with lru_cache so repeated calls from the same
+    driver (notebooks, sweeps) skip even the disk read. Callers get a
+    shallow copy so the cached frame cannot be mutated.
+    """
+    return _download_data_cached(ticker, period).copy(deep=False)
+
+
 def main(ticker: str, cash: float, period: str):
     # 1) get history
     df = download_data(ticker, period)
 
     # 2) wrap for Backtrader as 2-minute bars
-    data_feed = bt.feeds.PandasData(
+    data_feed = FastPandasData(
         dataname=df,
         timeframe=bt.TimeFrame.Minutes,
         compression=2,
@@ -63,15 +138,286 @@ def main(ticker: str, cash: float, period: str):
     logger.info(f"Final   Portfolio Value: {end_val:,.2f}")
 
 
+def _simulate_tp_sl(close, entry, cross_down, tp_pct, sl_pct, max_bars):
+    """
+    Single pass over the close array simulating QuickScalpMACD exits:
+    take-profit, stop-loss, MACD cross down, or max bars in trade.
+    Returns parallel arrays of (entry index, exit index, trade return).
+
+    Compiled with numba.njit when numba is available — the signal
+    masks are already vectorized, so this walk is the last Python-level
+    loop in the vectorized path.
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(n, np.int64)
+    exit_idx = np.empty(n, np.int64)
+    pnl = np.empty(n, np.float64)
+    k = 0
+    i = 0
+    while i < n:
+        if entry[i]:
+            entry_price = close[i]
+            tp = entry_price * (1.0 + tp_pct)
+            sl = entry_price * (1.0 - sl_pct)
+            exit_price = close[n - 1]
+            bars = 0
+            j = i + 1
+            while j < n:
+                bars += 1
+                price = close[j]
+                if (
+                    price >= tp
+                    or price <= sl
+                    or cross_down[j]
+                    or bars >= max_bars
+                ):
+                    exit_price = price
+                    break
+                j += 1
+            entry_idx[k] = i
+            exit_idx[k] = min(j, n - 1)
+            pnl[k] = exit_price / entry_price - 1.0
+            k += 1
+            i = j + 1
+        else:
+            i += 1
+    return entry_idx[:k], exit_idx[:k], pnl[:k]
+
+
+if njit is not None:
+    _simulate_tp_sl = njit(cache=True)(_simulate_tp_sl)
+
+
+def run_vectorized(df: pd.DataFrame, params: dict = None):
+    """
+    Vectorized alternative to the Backtrader QuickScalpMACD run.
+
+    MACD/RSI/EMA are computed once as NumPy arrays and the entry mask
+    is a handful of boolean ufuncs instead of a per-bar next() loop;
+    only the TP/SL exit simulation walks the close array. The
+    Backtrader path stays as the reference for validation.
+    """
+    p = dict(QuickScalpMACD.params._getitems())
+    if params:
+        p.update(params)
+
+    close_s = df["Close"]
+    macd_ind = MACD(
+        close_s,
+        window_fast=p["macd_fast"],
+        window_slow=p["macd_slow"],
+        window_sign=p["macd_signal"],
+    )
+    macd = macd_ind.macd().to_numpy()
+    signal = macd_ind.macd_signal().to_numpy()
+    rsi = RSIIndicator(close_s, window=p["rsi_period"]).rsi().to_numpy()
+    ema = close_s.ewm(span=p["ema_period"]).mean().to_numpy()
+    close = close_s.to_numpy()
+
+    diff = macd - signal
+    above = diff > 0
+    prev_above = np.concatenate(([False], above[:-1]))
+    cross_up = above & ~prev_above
+    cross_down = ~above & prev_above
+
+    prev_rsi = np.concatenate(([np.nan], rsi[:-1]))
+    entry = (
+        cross_up
+        & (macd < 0)
+        & (rsi < p["rsi_oversold"])
+        & (rsi > prev_rsi)
+        & (close >= ema * (1 - p["ema_tolerance"]))
+    )
+
+    entry_idx, exit_idx, pnl = _simulate_tp_sl(
+        close,
+        entry,
+        cross_down,
+        p["tp_pct"],
+        p["sl_pct"],
+        p["max_bars_in_trade"],
+    )
+    return float(np.prod(1.0 + pnl)), len(pnl)
+
+
+def run_optimize(ticker: str, cash: float, period: str, max_workers=None):
+    """
+    Sweep a QuickScalpMACD parameter grid inside a single cerebro via
+    optstrategy: Backtrader forks one task per combination (up to
+    maxcpus) and the data feed is loaded once for the whole grid
+    instead of once per config.
+    """
+    df = download_data(ticker, period)
+    data_feed = FastPandasData(
+        dataname=df,
+        timeframe=bt.TimeFrame.Minutes,
+        compression=2,
+    )
+
+    cerebro = bt.Cerebro(optreturn=True)
+    cerebro.adddata(data_feed)
+    cerebro.broker.setcash(cash)
+    cerebro.broker.setcommission(commission=0.0005)  # 5 bps
+    cerebro.optstrategy(
+        QuickScalpMACD,
+        ema_tolerance=[0.0025, 0.005, 0.01],
+        rsi_oversold=[25, 30, 35, 40],
+        tp_pct=[0.001, 0.002, 0.003],
+        sl_pct=[0.0005, 0.001],
+    )
+
+    results = cerebro.run(maxcpus=max_workers)
+    logger.info(f"{ticker}: optimized {len(results)} combinations")
+    return results
+
+
+def _share_dataframe(df: pd.DataFrame):
+    """
+    Publish the OHLCV values into a SharedMemory block so sweep
+    workers can map a zero-copy NumPy view instead of each unpickling
+    its own copy of the DataFrame.
+    """
+    values = np.ascontiguousarray(df.to_numpy())
+    shm = SharedMemory(create=True, size=values.nbytes)
+    buf = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+    buf[:] = values
+    meta = {
+        "name": shm.name,
+        "shape": values.shape,
+        "dtype": values.dtype,
+        "columns": list(df.columns),
+        "index": df.index.to_numpy(),
+    }
+    return shm, meta
+
+
+def _attach_dataframe(meta: dict):
+    """Rebuild the DataFrame over the shared block without copying."""
+    shm = SharedMemory(name=meta["name"])
+    values = np.ndarray(meta["shape"], dtype=meta["dtype"], buffer=shm.buf)
+    df = pd.DataFrame(
+        values,
+        index=pd.DatetimeIndex(meta["index"]),
+        columns=meta["columns"],
+        copy=False,
+    )
+    # the caller must keep shm alive (and close it) while df is in use
+    return df, shm
+
+
+def _sweep_worker(meta: dict, params: dict, cash: float) -> float:
+    """Run one QuickScalpMACD config against the shared OHLCV block."""
+    df, shm = _attach_dataframe(meta)
+    try:
+        data_feed = FastPandasData(
+            dataname=df,
+            timeframe=bt.TimeFrame.Minutes,
+            compression=2,
+        )
+        cerebro = bt.Cerebro()
+        cerebro.adddata(data_feed)
+        cerebro.broker.setcash(cash)
+        cerebro.broker.setcommission(commission=0.0005)  # 5 bps
+        cerebro.addstrategy(QuickScalpMACD, **params)
+        cerebro.run()
+        return cerebro.broker.getvalue()
+    finally:
+        shm.close()
+
+
+def run_sweep(ticker: str, param_grid, cash: float, period: str = "30d",
+              max_workers=None):
+    """
+    Optimize QuickScalpMACD over a list of parameter dicts for one
+    ticker. The history is downloaded once in the parent and shared
+    with the pool via multiprocessing.shared_memory, so adding configs
+    costs no extra download or per-worker pickle of the data.
+    """
+    param_grid = list(param_grid)
+    df = download_data(ticker, period)
+    shm, meta = _share_dataframe(df)
+
+    results = [None] * len(param_grid)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_sweep_worker, meta, params, cash): idx
+                for idx, params in enumerate(param_grid)
+            }
+            for fut in as_completed(futures):
+                idx = futures[fut]
+                try:
+                    results[idx] = fut.result()
+                    logger.info(
+                        f"Sweep config {idx} {param_grid[idx]}: "
+                        f"final value {results[idx]:,.2f}"
+                    )
+                except Exception as exc:
+                    logger.error(f"Sweep config {idx} failed: {exc}")
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
+
+
+def run_parallel(tickers, cash: float, period: str, max_workers=None):
+    """
+    Run one backtest per ticker across a process pool.
+
+    Backtrader's event loop is single-threaded and GIL-bound, so a
+    multi-instrument sweep scales ~linearly with cores when each
+    (download_data + cerebro.run) goes to its own process.
+    max_tasks_per_child=1 recycles workers so Backtrader's buffers are
+    released between tasks.
+    """
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {
+            pool.submit(main, ticker, cash, period): ticker
+            for ticker in tickers
+        }
+        for fut in as_completed(futures):
+            ticker = futures[fut]
+            try:
+                fut.result()
+                logger.info(f"Done: {ticker}")
+            except Exception as exc:
+                logger.error(f"Failed: {ticker} | {exc}")
+
+
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
-    ap.add_argument("--ticker", default="SPY")
+    ap.add_argument("--ticker", default="SPY")  # comma-separated for a sweep
     ap.add_argument("--cash", type=float, default=25_000)
     ap.add_argument("--period", default="30d")  # 2m bars for ~30 days
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--vectorized", action="store_true")
+    ap.add_argument("--optimize", action="store_true")
     args = ap.parse_args()
 
-    main(
-        ticker=args.ticker,
-        cash=args.cash,
-        period=args.period,
-    )
+    tickers = args.ticker.split(",")
+    if args.optimize:
+        for t in tickers:
+            run_optimize(t, args.cash, args.period, max_workers=args.workers)
+    elif args.vectorized:
+        for t in tickers:
+            cum_ret, n_trades = run_vectorized(download_data(t, args.period))
+            logger.info(
+                f"{t}: vectorized return x{cum_ret:.4f} over {n_trades} trades"
+            )
+    elif len(tickers) == 1:
+        main(
+            ticker=tickers[0],
+            cash=args.cash,
+            period=args.period,
+        )
+    else:
+        run_parallel(
+            tickers=tickers,
+            cash=args.cash,
+            period=args.period,
+            max_workers=args.workers,
+        )
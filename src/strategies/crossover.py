@@ -1,7 +1,123 @@
-import math
+import os
+
 import backtrader as bt
 from loguru import logger
 
+from src.strategies.streaming import StreamingEMA, StreamingMACD, StreamingRSI
+
+# Trade logging is dead weight during optimization sweeps; set
+# ZTDB_LOG_TRADES=0 to skip the log calls entirely.
+_LOG_TRADES = os.environ.get("ZTDB_LOG_TRADES", "1") != "0"
+
+# Single source for next(): the class-level reference is rendered from
+# this template with the constants as attribute reads, and __init__
+# renders it again per instance with the parameter-derived values
+# inlined as literals — so the two versions cannot drift.
+_NEXT_TEMPLATE = """\
+def _next(self):
+    i = len(self) - 1  # current bar index into the raw line arrays
+
+    # track bars in trade
+    if self.in_trade:
+        self.bars_in_trade += 1
+    else:
+        self.bars_in_trade = 0
+
+    # ================= ENTRY =================
+    if not self.in_trade:
+        # Single short-circuit chain, ordered by selectivity: the
+        # MACD cross is the rare predicate, so the vast majority of
+        # bars die on the first comparison before any further
+        # buffer reads happen.
+        if (
+            self._m[i] > self._s[i]
+            and self._m[i - 1] < self._s[i - 1]
+            and self._m[i] < 0
+            and self._c[i] >= self._e[i] * %(ema_tol_mult)s
+            and self._r[i] < %(rsi_oversold)s
+            and self._r[i] > self._r[i - 1]
+        ):
+            price = self._c[i]
+            size = self._calc_size(price)
+            if size <= 0:
+                return
+
+            self.entry_price = price
+            # cached here so in-trade bars skip the recompute
+            self._tp_price = price * %(tp_mult)s
+            self._sl_price = price * %(sl_mult)s
+            self.in_trade = True
+            self.buy(size=size)
+            if _LOG_TRADES:
+                # num2date parsing only happens on an actual trade
+                dt = self.data.datetime.datetime(0)
+                # brace-style args defer formatting to emit time
+                logger.info(
+                    "[{}] ENTER LONG {} @ {:.2f} | "
+                    "MACD={:.4f} (prev {:.4f}) "
+                    "RSI={:.2f} (prev {:.2f}) EMA{}={:.2f}",
+                    dt,
+                    size,
+                    price,
+                    self._m[i],
+                    self._m[i - 1],
+                    self._r[i],
+                    self._r[i - 1],
+                    %(ema_period)s,
+                    self._e[i],
+                )
+
+    # ================= EXIT =================
+    else:
+        price = self._c[i]
+        tp_price = self._tp_price
+        sl_price = self._sl_price
+
+        exit_reason = None
+
+        if price >= tp_price:
+            exit_reason = f"TP hit ({price:.2f} >= {tp_price:.2f})"
+        elif price <= sl_price:
+            exit_reason = f"SL hit ({price:.2f} <= {sl_price:.2f})"
+        elif self._m[i] < self._s[i] and self._m[i - 1] > self._s[i - 1]:
+            exit_reason = "MACD cross down"
+        elif self.bars_in_trade >= %(max_bars)s:
+            exit_reason = f"Max bars in trade reached ({self.bars_in_trade})"
+
+        if exit_reason:
+            self.close()
+            self.in_trade = False
+            if _LOG_TRADES:
+                dt = self.data.datetime.datetime(0)
+                logger.info(
+                    "[{}] EXIT LONG @ {:.2f} | "
+                    "{} | MACD={:.4f} RSI={:.2f} EMA={:.2f}",
+                    dt,
+                    price,
+                    exit_reason,
+                    self._m[i],
+                    self._r[i],
+                    self._e[i],
+                )
+"""
+
+# substitutions for the reference next(): plain attribute reads
+_GENERIC_SUBS = dict(
+    ema_tol_mult="self._ema_tol_mult",
+    rsi_oversold="self._rsi_oversold",
+    tp_mult="self._tp_mult",
+    sl_mult="self._sl_mult",
+    max_bars="self._max_bars",
+    ema_period="self.p.ema_period",
+)
+
+
+def _render_next(subs: dict):
+    """Compile a next() from _NEXT_TEMPLATE with the given substitutions."""
+    ns = {"logger": logger, "_LOG_TRADES": _LOG_TRADES, "__name__": __name__}
+    exec(compile(_NEXT_TEMPLATE % subs, "<QuickScalpMACD.next>", "exec"), ns)
+    return ns["_next"]
+
 
 class QuickScalpMACD(bt.Strategy):
     """
@@ -40,120 +156,82 @@ class QuickScalpMACD(bt.Strategy):
     def __init__(self):
         close = self.data.close
 
-        # MACD
-        self.macd = bt.ind.MACD(
+        # MACD (streaming: O(1) recursive state per bar)
+        self.macd = StreamingMACD(
             close,
             period_me1=self.p.macd_fast,
             period_me2=self.p.macd_slow,
             period_signal=self.p.macd_signal,
         )
-        self.cross = bt.ind.CrossOver(self.macd.macd, self.macd.signal)
-
-        # EMA200 trend filter
-        self.ema = bt.ind.EMA(close, period=self.p.ema_period)
-
-        # RSI filter
-        self.rsi = bt.ind.RSI(close, period=self.p.rsi_period)
+        # crossovers are derived in next() straight from the macd and
+        # signal buffers (sign change of macd - signal), so no
+        # CrossOver indicator sits in Backtrader's per-bar dispatch
+
+        # EMA200 trend filter (streaming)
+        self.ema = StreamingEMA(close, period=self.p.ema_period)
+
+        # RSI filter (streaming Welles-Wilder)
+        self.rsi = StreamingRSI(close, period=self.p.rsi_period)
+
+        # Raw line buffers, bound once: next() indexes these array.array
+        # objects directly instead of going through the LineBuffer
+        # wrappers (one C-level __getitem__ vs. attribute chain + float()).
+        self._c = self.data.close.array
+        self._m = self.macd.macd.array
+        self._s = self.macd.signal.array
+        self._e = self.ema.ema.array
+        self._r = self.rsi.rsi.array
+
+        # Parameter-derived constants, hoisted so next() does not
+        # rebuild them (and re-resolve self.p.*) every bar
+        self._ema_tol_mult = 1.0 - self.p.ema_tolerance
+        self._tp_mult = 1.0 + self.p.tp_pct
+        self._sl_mult = 1.0 - self.p.sl_pct
+        self._rsi_oversold = self.p.rsi_oversold
+        self._max_bars = self.p.max_bars_in_trade
+        self._get_equity = self.broker.getvalue
 
         # Simple internal state
         self.in_trade = False
         self.entry_price = None
+        self._tp_price = None
+        self._sl_price = None
         self.bars_in_trade = 0
 
+        # Specialize next() for this instance's fixed parameters by
+        # re-rendering the template with the constants as literals.
+        # Skipped when a subclass overrides next(), which the
+        # instance-bound function would otherwise shadow.
+        if type(self).next is QuickScalpMACD.next:
+            self.next = _render_next(dict(
+                ema_tol_mult=repr(self._ema_tol_mult),
+                rsi_oversold=repr(self._rsi_oversold),
+                tp_mult=repr(self._tp_mult),
+                sl_mult=repr(self._sl_mult),
+                max_bars=repr(self._max_bars),
+                ema_period=repr(self.p.ema_period),
+            )).__get__(self)
+
     def _calc_size(self, price: float) -> int:
         """
         Position size based on risk_per_trade and stop distance,
         BUT never more than you can actually afford.
         """
-        equity = self.broker.getvalue()
-        risk_cap = equity * self.p.risk_per_trade   # $ we’re ok to lose
-        sl_dist = price * self.p.sl_pct             # $ distance to stop
+        equity = self._get_equity()
 
+        sl_dist = price * self.p.sl_pct             # $ distance to stop
         if sl_dist <= 0:
             return 0
 
-        # size based on risk
-        raw_risk_size = risk_cap / sl_dist
-
-        # size based on what we can afford
-        max_affordable = math.floor(equity / price)
-
-        size = min(raw_risk_size, max_affordable)
-        return max(1, math.floor(size))
-
-    def next(self):
-        price = float(self.data.close[0])
-        ema_val = float(self.ema[0])
-        macd_val = float(self.macd.macd[0])
-        rsi_val = float(self.rsi[0])
-
-        # previous bar values (for “curling up” checks)
-        prev_macd = float(self.macd.macd[-1])
-        prev_signal = float(self.macd.signal[-1])
-        prev_rsi = float(self.rsi[-1])
-
-        dt = self.data.datetime.datetime(0)
-
-        # track bars in trade
-        if self.in_trade:
-            self.bars_in_trade += 1
-        else:
-            self.bars_in_trade = 0
-
-        # ================= ENTRY =================
-        if not self.in_trade:
-            ema_floor = ema_val * (1 - self.p.ema_tolerance)
-
-            macd_cross_up = self.cross > 0
-            macd_below_zero = macd_val < 0
-            rsi_oversold_and_rising = (
-                rsi_val < self.p.rsi_oversold and rsi_val > prev_rsi
-            )
-            ema_trend_ok = price >= ema_floor
-
-            buy_condition = (
-                macd_cross_up
-                and macd_below_zero
-                and rsi_oversold_and_rising
-                and ema_trend_ok
-            )
-
-            if buy_condition:
-                size = self._calc_size(price)
-                if size <= 0:
-                    return
-
-                self.entry_price = price
-                self.in_trade = True
-                self.buy(size=size)
-                logger.info(
-                    f"[{dt}] ENTER LONG {size} @ {price:.2f} | "
-                    f"MACD={macd_val:.4f} (prev {prev_macd:.4f}) "
-                    f"RSI={rsi_val:.2f} (prev {prev_rsi:.2f}) "
-                    f"EMA{self.p.ema_period}={ema_val:.2f}"
-                )
+        # size based on risk; int() truncation stands in for math.floor
+        raw_risk_size = int(equity * self.p.risk_per_trade / sl_dist)
 
-        # ================= EXIT =================
-        else:
-            tp_price = self.entry_price * (1 + self.p.tp_pct)
-            sl_price = self.entry_price * (1 - self.p.sl_pct)
-
-            exit_reason = None
-
-            if price >= tp_price:
-                exit_reason = f"TP hit ({price:.2f} >= {tp_price:.2f})"
-            elif price <= sl_price:
-                exit_reason = f"SL hit ({price:.2f} <= {sl_price:.2f})"
-            elif self.cross < 0:
-                exit_reason = "MACD cross down"
-            elif self.bars_in_trade >= self.p.max_bars_in_trade:
-                exit_reason = f"Max bars in trade reached ({self.bars_in_trade})"
-
-            if exit_reason:
-                self.close()
-                self.in_trade = False
-                logger.info(
-                    f"[{dt}] EXIT LONG @ {price:.2f} | "
-                    f"{exit_reason} | MACD={macd_val:.4f} RSI={rsi_val:.2f} "
-                    f"EMA={ema_val:.2f}"
-                )
+        # size based on what we can afford; float // keeps the exact
+        # price (truncating it to cents overestimated what fits)
+        max_affordable = int(equity // price)
+
+        return max(1, min(raw_risk_size, max_affordable))
+
+    # reference next(), rendered from the shared template with the
+    # hoisted constants read as attributes (see _NEXT_TEMPLATE)
+    next = _render_next(_GENERIC_SUBS)
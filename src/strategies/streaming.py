@@ -0,0 +1,138 @@
+import backtrader as bt
+
+
+class StreamingEMA(bt.Indicator):
+    """
+    EMA kept as a single recursive value updated in O(1) per bar
+    (ema += alpha * (x - ema)) instead of Backtrader recomputing over
+    the lookback buffer. Seeded with the SMA of the first `period`
+    bars, matching bt.ind.EMA.
+    """
+
+    lines = ("ema",)
+    params = dict(period=30)
+
+    def __init__(self):
+        self._alpha = 2.0 / (self.p.period + 1.0)
+        self._ema = 0.0
+        self._seen = 0
+        self.addminperiod(self.p.period)
+
+    def _update(self):
+        x = self.data[0]
+        self._seen += 1
+        if self._seen <= self.p.period:
+            # running mean doubles as the SMA seed
+            self._ema += (x - self._ema) / self._seen
+        else:
+            self._ema += self._alpha * (x - self._ema)
+
+    def prenext(self):
+        self._update()
+
+    def next(self):
+        self._update()
+        self.lines.ema[0] = self._ema
+
+
+class StreamingRSI(bt.Indicator):
+    """
+    Welles-Wilder RSI with the gain/loss averages held as recursive
+    state (avg = (avg * (n - 1) + x) / n), so each bar costs a few
+    FMAs instead of an O(window) rescan.
+    """
+
+    lines = ("rsi",)
+    params = dict(period=14)
+
+    def __init__(self):
+        self._prev = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._seen = 0
+        self.addminperiod(self.p.period + 1)
+
+    def _update(self):
+        x = self.data[0]
+        if self._prev is None:
+            self._prev = x
+            return
+        change = x - self._prev
+        self._prev = x
+
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+
+        n = self.p.period
+        self._seen += 1
+        if self._seen <= n:
+            # plain average over the first `period` changes (Wilder seed)
+            self._avg_gain += (gain - self._avg_gain) / self._seen
+            self._avg_loss += (loss - self._avg_loss) / self._seen
+        else:
+            self._avg_gain = (self._avg_gain * (n - 1) + gain) / n
+            self._avg_loss = (self._avg_loss * (n - 1) + loss) / n
+
+    def prenext(self):
+        self._update()
+
+    def next(self):
+        self._update()
+        if self._avg_loss == 0.0:
+            self.lines.rsi[0] = 100.0
+        else:
+            rs = self._avg_gain / self._avg_loss
+            self.lines.rsi[0] = 100.0 - 100.0 / (1.0 + rs)
+
+
+class StreamingMACD(bt.Indicator):
+    """
+    MACD as the difference of two streaming EMAs plus a streaming
+    signal EMA over it — three O(1) updates per bar. Line names match
+    bt.ind.MACD so CrossOver and strategy code need no changes.
+    """
+
+    lines = ("macd", "signal")
+    params = dict(period_me1=12, period_me2=26, period_signal=9)
+
+    def __init__(self):
+        self._a_fast = 2.0 / (self.p.period_me1 + 1.0)
+        self._a_slow = 2.0 / (self.p.period_me2 + 1.0)
+        self._a_sig = 2.0 / (self.p.period_signal + 1.0)
+        self._fast = 0.0
+        self._slow = 0.0
+        self._sig = 0.0
+        self._seen = 0
+        self._sig_seen = 0
+        self.addminperiod(self.p.period_me2 + self.p.period_signal - 1)
+
+    def _update(self):
+        x = self.data[0]
+        self._seen += 1
+
+        if self._seen <= self.p.period_me1:
+            self._fast += (x - self._fast) / self._seen
+        else:
+            self._fast += self._a_fast * (x - self._fast)
+
+        if self._seen <= self.p.period_me2:
+            self._slow += (x - self._slow) / self._seen
+        else:
+            self._slow += self._a_slow * (x - self._slow)
+
+        # signal EMA only starts once the slow EMA is live
+        if self._seen >= self.p.period_me2:
+            macd = self._fast - self._slow
+            self._sig_seen += 1
+            if self._sig_seen <= self.p.period_signal:
+                self._sig += (macd - self._sig) / self._sig_seen
+            else:
+                self._sig += self._a_sig * (macd - self._sig)
+
+    def prenext(self):
+        self._update()
+
+    def next(self):
+        self._update()
+        self.lines.macd[0] = self._fast - self._slow
+        self.lines.signal[0] = self._sig